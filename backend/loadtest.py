@@ -0,0 +1,731 @@
+"""Load-test harness for the Liquidity Command API.
+
+Drives ``main.app`` with asyncio clients against a stubbed data layer (no FRED
+or Yahoo traffic), sweeps concurrency levels and writes a latency/throughput
+report plus folded-stack profiles that flamegraph.pl, inferno or speedscope
+can render directly.
+
+``--mode inprocess`` calls the ASGI app through httpx without sockets. The
+endpoints do their work synchronously, so each request runs to completion once
+started: latencies there are service times and throughput is the ceiling.
+``--mode localhost`` serves the app with uvicorn on a background thread, which
+adds real sockets and shows queueing latency under concurrency.
+
+``--cold-start`` boots real ``uvicorn main:app`` subprocesses (real data layer,
+so put a real FRED_API_KEY in the environment or .env for meaningful numbers)
+and records time to first response, to ready (readiness probe passes: snapshot
+loaded or pre-warm done) and to fresh (pre-warm done) alongside the startup
+timings the app reports in /api/health. Each child works on a temporary copy of the
+snapshot, so your own snapshot file is never overwritten.
+
+Usage:
+    python loadtest.py                                  # in-process ASGI, default sweep
+    python loadtest.py --concurrency 1,50,200 --duration 20
+    python loadtest.py --mode localhost --ws-clients 100,1000,5000
+    python loadtest.py --ws-clients 100,500 --ws-hold 65          # two rounds of handler broadcasts
+    python loadtest.py --fetch-delay 0.2 --no-cache     # simulate slow blocking fetches
+    python loadtest.py --cold-start fast,eager --ws-clients ""
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+# main.py builds a real LiquidityService at import time, which insists on a key.
+# Load .env first so a real key still reaches the --cold-start subprocesses.
+load_dotenv()
+STUB_FRED_API_KEY = "loadtest"
+os.environ.setdefault("FRED_API_KEY", STUB_FRED_API_KEY)
+
+import main  # noqa: E402
+from services.liquidity_service import LiquidityService  # noqa: E402
+
+# series_id -> (frequency, starting level, drift per step, volatility per step)
+STUB_SERIES = {
+    'WALCL': ('W-WED', 7_500_000.0, 0.0004, 0.004),
+    'M2SL': ('MS', 20_000.0, 0.003, 0.004),
+    'IPMANSICS': ('MS', 100.0, 0.0005, 0.006),
+    'WTREGEN': ('W-WED', 700_000.0, 0.0, 0.05),
+    'RRPONTSYD': ('B', 500.0, 0.0, 0.03),
+}
+STUB_MARKETS = {
+    'BTC-USD': ('D', 30_000.0, 0.001, 0.03),
+    '^GSPC': ('B', 4_000.0, 0.0003, 0.01),
+}
+
+
+def _synthetic_series(key: str, spec: tuple, years: int = 6) -> pd.Series:
+    """Deterministic random-walk series ending today."""
+    freq, base, drift, vol = spec
+    rng = np.random.default_rng(zlib.crc32(key.encode()))
+    end = pd.Timestamp.today().normalize()
+    index = pd.date_range(end - pd.DateOffset(years=years), end, freq=freq)
+    values = base * np.exp(np.cumsum(rng.normal(drift, vol, len(index))))
+    return pd.Series(values, index=index, name=key)
+
+
+class StubLiquidityService(LiquidityService):
+    """LiquidityService with FRED and Yahoo replaced by synthetic data.
+
+    All of the real computation still runs; only the network is stubbed.
+    ``fetch_delay`` blocks the calling thread per fetch, like the real clients do.
+    """
+
+    def __init__(self, fetch_delay: float = 0.0, use_cache: bool = True):
+        super().__init__()
+        self.fetch_delay = fetch_delay
+        if not use_cache:
+            self._cache_timeout = 0
+            self._response_cache_timeout = 0
+        self._series = {key: _synthetic_series(key, spec) for key, spec in STUB_SERIES.items()}
+        self._markets = {key: _synthetic_series(key, spec).to_frame('Close') for key, spec in STUB_MARKETS.items()}
+
+    def _get_series(self, series_id: str) -> pd.Series:
+        now = datetime.now()
+        cached = self._cache.get(series_id)
+        if cached and (now - cached[0]).total_seconds() < self._cache_timeout:
+            return cached[1]
+        if self.fetch_delay:
+            time.sleep(self.fetch_delay)
+        series = self._series[series_id]
+        self._cache[series_id] = (now, series)
+        return series
+
+    def _download_close(self, ticker: str, start: str, end: str) -> pd.DataFrame:
+        if self.fetch_delay:
+            time.sleep(self.fetch_delay)
+        frame = self._markets[ticker]
+        return frame.loc[start:end]
+
+
+class StackSampler:
+    """Samples one thread's Python stack and aggregates it in folded format."""
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def write_folded(self, path: str):
+        with open(path, "w") as fh:
+            for stack, count in self.stacks.most_common():
+                fh.write(f"{stack} {count}\n")
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def _latency_summary(latencies: List[float]) -> Dict[str, float]:
+    values = sorted(latencies)
+    return {
+        "p50_ms": _percentile(values, 50) * 1000,
+        "p90_ms": _percentile(values, 90) * 1000,
+        "p99_ms": _percentile(values, 99) * 1000,
+        "max_ms": (values[-1] if values else 0.0) * 1000,
+        "mean_ms": (sum(values) / len(values) if values else 0.0) * 1000,
+    }
+
+
+def _slug(path: str) -> str:
+    return path.strip("/").replace("/", "-").replace("?", "-").replace("=", "-") or "root"
+
+
+class InProcessWebSocket:
+    """Minimal ASGI websocket client that talks to the app without a socket."""
+
+    def __init__(self, app: Callable, path: str):
+        self.app = app
+        self.path = path
+        self._inbound: asyncio.Queue = asyncio.Queue()
+        self._outbound: asyncio.Queue = asyncio.Queue()
+        self._accepted = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def connect(self):
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "scheme": "ws",
+            "path": self.path,
+            "raw_path": self.path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"loadtest")],
+            "client": ("127.0.0.1", 0),
+            "server": ("loadtest", 80),
+            "subprotocols": [],
+        }
+        await self._inbound.put({"type": "websocket.connect"})
+        self._task = asyncio.create_task(self.app(scope, self._inbound.get, self._send))
+        accepted = asyncio.create_task(self._accepted.wait())
+        await asyncio.wait([accepted, self._task], return_when=asyncio.FIRST_COMPLETED)
+        if not self._accepted.is_set():
+            accepted.cancel()
+            raise ConnectionError("websocket rejected")
+
+    async def _send(self, message: Dict[str, Any]):
+        if message["type"] == "websocket.accept":
+            self._accepted.set()
+        elif message["type"] == "websocket.send":
+            if self._closed:
+                raise ConnectionError("websocket closed")
+            await self._outbound.put(message.get("text") or message.get("bytes"))
+
+    async def recv(self):
+        return await self._outbound.get()
+
+    async def close(self):
+        self._closed = True
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except BaseException:
+                pass
+
+
+class LoadTestTarget:
+    """Where requests go: the ASGI app in this process, or a uvicorn server on localhost."""
+
+    def __init__(self, mode: str, port: int, gzip: bool):
+        self.mode = mode
+        self.port = port
+        self.headers = {"accept-encoding": "gzip" if gzip else "identity"}
+        self.server_thread_id: Optional[int] = None
+        self._server = None
+        self._server_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.mode != "localhost":
+            self.server_thread_id = threading.get_ident()
+            return
+        import uvicorn
+
+        # Lifespan is off so the startup pre-warm and periodic broadcast stay out of the numbers.
+        # /ws handlers sleep between sends and never see the disconnect, so don't wait on them at exit.
+        config = uvicorn.Config(main.app, host="127.0.0.1", port=self.port, log_level="warning",
+                                lifespan="off", timeout_graceful_shutdown=1)
+        self._server = uvicorn.Server(config)
+        self._server_loop = asyncio.new_event_loop()
+
+        def serve():
+            self.server_thread_id = threading.get_ident()
+            asyncio.set_event_loop(self._server_loop)
+            self._server_loop.run_until_complete(self._server.serve())
+
+        self._thread = threading.Thread(target=serve, name="uvicorn", daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError(f"uvicorn failed to start on port {self.port}")
+            time.sleep(0.05)
+
+    def stop(self):
+        if self._server:
+            # The abandoned /ws handlers get cancelled at exit; uvicorn logs each one as an error.
+            logging.getLogger("uvicorn.error").setLevel(logging.CRITICAL)
+            self._server.should_exit = True
+            self._thread.join()
+
+    def reset_websockets(self):
+        """Forget every /ws connection from earlier levels before timing the next one.
+
+        WebSocketManager only drops a socket when a send to it fails, and the /ws
+        handlers sleep for 30s without noticing disconnects. On localhost the server
+        is restarted so those handlers are cancelled too; in-process they are
+        cancelled by InProcessWebSocket.close.
+        """
+        if self._server:
+            self.stop()
+            main.websocket_manager.active_connections.clear()
+            self.start()
+        else:
+            main.websocket_manager.active_connections.clear()
+
+    def http_client(self) -> httpx.AsyncClient:
+        if self.mode == "localhost":
+            return httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{self.port}",
+                headers=self.headers,
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=None),
+                timeout=60.0,
+            )
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=main.app),
+            base_url="http://loadtest",
+            headers=self.headers,
+            timeout=60.0,
+        )
+
+    async def ws_connect(self, path: str):
+        if self.mode == "localhost":
+            import websockets
+
+            return await websockets.connect(f"ws://127.0.0.1:{self.port}{path}", max_queue=None)
+        ws = InProcessWebSocket(main.app, path)
+        await ws.connect()
+        return ws
+
+    async def run_on_server(self, coro):
+        """Await ``coro`` on the loop that serves the app."""
+        if self._server_loop is None:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._server_loop))
+
+    async def broadcast(self, payload: Dict[str, Any]):
+        """Run WebSocketManager.broadcast on the loop that owns the connections."""
+        await self.run_on_server(main.websocket_manager.broadcast(payload))
+
+
+async def _loop_stalls(duration: float, interval: float = 0.01) -> List[float]:
+    """How late each short sleep wakes up on the current loop, i.e. how long it was blocked."""
+    stalls: List[float] = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        stalls.append(max(0.0, time.perf_counter() - started - interval))
+    return stalls
+
+
+async def run_http_level(target: LoadTestTarget, path: str, concurrency: int, duration: float) -> Dict[str, Any]:
+    """``concurrency`` pollers hammer ``path`` back-to-back for ``duration`` seconds."""
+    latencies: List[float] = []
+    errors: Counter = Counter()
+    body_bytes = 0
+
+    async with target.http_client() as client:
+        await client.get(path)  # warm the response cache and connection pool
+        deadline = time.perf_counter() + duration
+
+        async def poller():
+            nonlocal body_bytes
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    elapsed = time.perf_counter() - started
+                    if response.status_code == 200:
+                        latencies.append(elapsed)
+                        body_bytes += response.num_bytes_downloaded
+                    else:
+                        errors[str(response.status_code)] += 1
+                except Exception as e:
+                    errors[type(e).__name__] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(poller() for _ in range(concurrency)))
+        wall = time.perf_counter() - started
+
+    result = {
+        "endpoint": path,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": dict(errors),
+        "throughput_rps": len(latencies) / wall if wall else 0.0,
+        "avg_wire_bytes": body_bytes / len(latencies) if latencies else 0.0,
+    }
+    result.update(_latency_summary(latencies))
+    return result
+
+
+async def run_ws_level(target: LoadTestTarget, clients: int, rounds: int, payload: Dict[str, Any],
+                       hold: float) -> Dict[str, Any]:
+    """Open ``clients`` sockets on /ws, time ``rounds`` broadcasts reaching all of them, then
+    keep them connected for ``hold`` seconds.
+
+    Every /ws handler broadcasts to every client 30s after connecting, so a hold of 30s
+    or more measures the N x N fan-out the app produces on its own: message rate,
+    delivery lag (receive time minus the payload timestamp) and event-loop stalls.
+    """
+    connect_latencies: List[float] = []
+    connect_errors: Counter = Counter()
+
+    async def open_one():
+        started = time.perf_counter()
+        try:
+            ws = await target.ws_connect("/ws")
+            connect_latencies.append(time.perf_counter() - started)
+            return ws
+        except Exception as e:
+            connect_errors[type(e).__name__] += 1
+            return None
+
+    sockets = [ws for ws in await asyncio.gather(*(open_one() for _ in range(clients))) if ws is not None]
+
+    # The server registers a socket just after accepting it; don't start timing before it has.
+    deadline = time.perf_counter() + 5
+    while len(main.websocket_manager.active_connections) < len(sockets) and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+    registered = len(main.websocket_manager.active_connections)
+    fanout: List[float] = []
+    delivery: List[float] = []
+    lost = 0
+    for _ in range(rounds):
+        started = time.perf_counter()
+
+        async def receive(ws):
+            await ws.recv()
+            delivery.append(time.perf_counter() - started)
+
+        await target.broadcast(payload)
+        results = await asyncio.gather(
+            *(asyncio.wait_for(receive(ws), timeout=30) for ws in sockets), return_exceptions=True
+        )
+        lost += sum(1 for r in results if isinstance(r, BaseException))
+        fanout.append(time.perf_counter() - started)
+
+    hold_counts = [0] * len(sockets)
+    hold_lags: List[float] = []
+    stalls: List[float] = []
+    if hold > 0 and sockets:
+        async def listen(index: int, ws):
+            while True:
+                message = await ws.recv()
+                received = datetime.now()
+                hold_counts[index] += 1
+                try:
+                    sent = datetime.fromisoformat(json.loads(message)["timestamp"])
+                    hold_lags.append((received - sent).total_seconds())
+                except (ValueError, KeyError, TypeError):
+                    pass
+
+        listeners = [asyncio.create_task(listen(i, ws)) for i, ws in enumerate(sockets)]
+        stalls = await target.run_on_server(_loop_stalls(hold))
+        for listener in listeners:
+            listener.cancel()
+        await asyncio.gather(*listeners, return_exceptions=True)
+
+    await asyncio.gather(*(ws.close() for ws in sockets), return_exceptions=True)
+
+    connect = _latency_summary(connect_latencies)
+    deliver = _latency_summary(delivery)
+    lag = _latency_summary(hold_lags)
+    stall = _latency_summary(stalls)
+    return {
+        "clients": clients,
+        "connected": len(sockets),
+        "registered_connections": registered,
+        "connect_errors": dict(connect_errors),
+        "connect_p50_ms": connect["p50_ms"],
+        "connect_p99_ms": connect["p99_ms"],
+        "broadcast_rounds": rounds,
+        "lost_messages": lost,
+        "fanout_p50_ms": _latency_summary(fanout)["p50_ms"],
+        "fanout_max_ms": _latency_summary(fanout)["max_ms"],
+        "delivery_p99_ms": deliver["p99_ms"],
+        "hold_seconds": hold,
+        # Each handler fires once per 30s to every client.
+        "hold_expected_messages": len(sockets) ** 2 * int(hold // 30),
+        "hold_messages": sum(hold_counts),
+        "hold_message_rate": sum(hold_counts) / hold if hold > 0 else 0.0,
+        "hold_lag_p50_ms": lag["p50_ms"],
+        "hold_lag_p99_ms": lag["p99_ms"],
+        "hold_lag_max_ms": lag["max_ms"],
+        "loop_stall_p99_ms": stall["p99_ms"],
+        "loop_stall_max_ms": stall["max_ms"],
+    }
+
+
+async def measure_cold_start(mode: str, port: int, fresh_timeout: float) -> Dict[str, Any]:
+    """Boot a new API process in ``mode`` and time it until it is live, ready and fresh."""
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    snapshot_dir = tempfile.mkdtemp(prefix="loadtest-snapshot-")
+    snapshot_path = os.path.join(snapshot_dir, "liquidity_snapshot.json")
+    source_snapshot = os.path.join(backend_dir, main.SNAPSHOT_PATH) if main.SNAPSHOT_PATH else ""
+    if source_snapshot and os.path.exists(source_snapshot):
+        shutil.copy(source_snapshot, snapshot_path)
+
+    env = dict(os.environ, STARTUP_MODE=mode, SNAPSHOT_PATH=snapshot_path)
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=backend_dir, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=5.0) as client:
+            while True:
+                if proc.poll() is not None:
+                    raise RuntimeError(f"API process exited with code {proc.returncode}")
+                try:
+                    response = await client.get("/api/health/live")
+                    if response.status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.01)
+            first_response = time.perf_counter() - started
+            first_health = (await client.get("/api/health")).json()
+
+            time_to_ready = first_response if first_health.get("ready") else None
+            time_to_fresh = first_response if first_health.get("fresh") else None
+            health = first_health
+            while time_to_fresh is None and time.perf_counter() - started < fresh_timeout:
+                await asyncio.sleep(0.1)
+                if time_to_ready is None and (await client.get("/api/health/ready")).status_code == 200:
+                    time_to_ready = time.perf_counter() - started
+                health = (await client.get("/api/health")).json()
+                if health.get("fresh"):
+                    time_to_fresh = time.perf_counter() - started
+                    time_to_ready = time_to_ready or time_to_fresh
+    finally:
+        proc.terminate()
+        proc.wait()
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+    return {
+        "mode": mode,
+        "placeholder_fred_key": env.get("FRED_API_KEY") == STUB_FRED_API_KEY,
+        "time_to_first_response_seconds": first_response,
+        "time_to_ready_seconds": time_to_ready,
+        "time_to_fresh_seconds": time_to_fresh,
+        "ready_at_first_response": first_health.get("ready"),
+        "serving_snapshot": first_health.get("serving_snapshot"),
+        "app": health.get("startup", {}),
+    }
+
+
+def write_markdown(report: Dict[str, Any], path: str):
+    lines = [
+        f"# Load test report ({report['started']})",
+        "",
+        f"- mode: `{report['config']['mode']}`, gzip: `{report['config']['gzip']}`, "
+        f"cache: `{report['config']['cache']}`, fetch delay: `{report['config']['fetch_delay']}s`, "
+        f"duration per level: `{report['config']['duration']}s`",
+        "",
+        "## HTTP",
+        "",
+        "| endpoint | concurrency | requests | errors | rps | p50 ms | p90 ms | p99 ms | max ms | wire bytes |",
+        "|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+    for r in report["http"]:
+        lines.append(
+            f"| `{r['endpoint']}` | {r['concurrency']} | {r['requests']} | {sum(r['errors'].values())} "
+            f"| {r['throughput_rps']:.1f} | {r['p50_ms']:.1f} | {r['p90_ms']:.1f} | {r['p99_ms']:.1f} "
+            f"| {r['max_ms']:.1f} | {r['avg_wire_bytes']:.0f} |"
+        )
+    if report["websocket"]:
+        lines += [
+            "",
+            "## WebSocket /ws",
+            "",
+            "| clients | connected | registered | connect p50 ms | connect p99 ms | fan-out p50 ms | fan-out max ms "
+            "| delivery p99 ms | lost |",
+            "|---:|---:|---:|---:|---:|---:|---:|---:|---:|",
+        ]
+        for r in report["websocket"]:
+            lines.append(
+                f"| {r['clients']} | {r['connected']} | {r['registered_connections']} | {r['connect_p50_ms']:.1f} | {r['connect_p99_ms']:.1f} "
+                f"| {r['fanout_p50_ms']:.1f} | {r['fanout_max_ms']:.1f} | {r['delivery_p99_ms']:.1f} | {r['lost_messages']} |"
+            )
+        if report["config"]["ws_hold"] > 0:
+            lines += [
+                "",
+                f"### Hold ({report['config']['ws_hold']}s, handlers broadcasting every 30s)",
+                "",
+                "| clients | messages | expected | msg/s | lag p50 ms | lag p99 ms | lag max ms | loop stall p99 ms | loop stall max ms |",
+                "|---:|---:|---:|---:|---:|---:|---:|---:|---:|",
+            ]
+            for r in report["websocket"]:
+                lines.append(
+                    f"| {r['clients']} | {r['hold_messages']} | {r['hold_expected_messages']} | {r['hold_message_rate']:.1f} "
+                    f"| {r['hold_lag_p50_ms']:.1f} | {r['hold_lag_p99_ms']:.1f} | {r['hold_lag_max_ms']:.1f} "
+                    f"| {r['loop_stall_p99_ms']:.1f} | {r['loop_stall_max_ms']:.1f} |"
+                )
+    if report["cold_start"]:
+        lines += [
+            "",
+            "## Cold start",
+            "",
+            "| mode | first response s | ready s | fresh s | app import s | app startup s | pre-warm s "
+            "| ready at first response | serving snapshot | placeholder key |",
+            "|---|---:|---:|---:|---:|---:|---:|---|---|---|",
+        ]
+        for r in report["cold_start"]:
+            ready = f"{r['time_to_ready_seconds']:.2f}" if r["time_to_ready_seconds"] is not None else "timeout"
+            fresh = f"{r['time_to_fresh_seconds']:.2f}" if r["time_to_fresh_seconds"] is not None else "timeout"
+            prewarm = r["app"].get("prewarm_seconds")
+            lines.append(
+                f"| {r['mode']} | {r['time_to_first_response_seconds']:.2f} | {ready} | {fresh} "
+                f"| {r['app'].get('import_seconds') or 0:.2f} | {r['app'].get('startup_seconds') or 0:.2f} "
+                f"| {f'{prewarm:.2f}' if prewarm is not None else '-'} | {r['ready_at_first_response']} "
+                f"| {r['serving_snapshot']} | {r['placeholder_fred_key']} |"
+            )
+    if report["profiles"]:
+        lines += ["", "## Profiles (folded stacks)", ""]
+        lines += [f"- `{p}`" for p in report["profiles"]]
+    with open(path, "w") as fh:
+        fh.write("\n".join(lines) + "\n")
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    service = StubLiquidityService(fetch_delay=args.fetch_delay, use_cache=not args.no_cache)
+    # Lifespan is off, so warm up here: the sweeps measure the ready steady state.
+    await service.prewarm()
+    main.liquidity_service = service
+
+    target = LoadTestTarget(args.mode, args.port, gzip=not args.no_gzip)
+    target.start()
+    os.makedirs(args.output, exist_ok=True)
+
+    report: Dict[str, Any] = {
+        "started": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "mode": args.mode,
+            "gzip": not args.no_gzip,
+            "cache": not args.no_cache,
+            "fetch_delay": args.fetch_delay,
+            "duration": args.duration,
+            "ws_hold": args.ws_hold,
+        },
+        "http": [],
+        "websocket": [],
+        "cold_start": [],
+        "profiles": [],
+    }
+
+    def profiled(name: str):
+        if args.no_profile:
+            return None
+        sampler = StackSampler(target.server_thread_id, args.profile_interval)
+        sampler.start()
+        return sampler, os.path.join(args.output, f"{name}.folded")
+
+    def finish(profile):
+        if profile:
+            sampler, path = profile
+            sampler.stop()
+            sampler.write_folded(path)
+            report["profiles"].append(os.path.basename(path))
+
+    try:
+        for mode in args.cold_start:
+            print(f"Cold start ({mode})...")
+            result = await measure_cold_start(mode, args.port + 1, args.cold_start_timeout)
+            report["cold_start"].append(result)
+            ready = result["time_to_ready_seconds"]
+            fresh = result["time_to_fresh_seconds"]
+            print(f"  first response after {result['time_to_first_response_seconds']:.2f}s, "
+                  + (f"ready after {ready:.2f}s, " if ready is not None else "not ready, ")
+                  + (f"fresh after {fresh:.2f}s" if fresh is not None else "not fresh before timeout"))
+            if result["placeholder_fred_key"]:
+                print("  warning: no FRED_API_KEY set, the pre-warm cannot succeed")
+
+        for path in args.endpoints:
+            for level in args.concurrency:
+                print(f"HTTP {path} x{level} for {args.duration}s...")
+                profile = profiled(f"http-{_slug(path)}-c{level}")
+                result = await run_http_level(target, path, level, args.duration)
+                finish(profile)
+                report["http"].append(result)
+                print(f"  {result['throughput_rps']:.1f} rps, p50 {result['p50_ms']:.1f} ms, "
+                      f"p99 {result['p99_ms']:.1f} ms, errors {sum(result['errors'].values())}")
+
+        if args.ws_clients:
+            payload = (await service.get_liquidity_data()).dict()
+            for clients in args.ws_clients:
+                print(f"WebSocket /ws with {clients} clients...")
+                target.reset_websockets()
+                profile = profiled(f"ws-c{clients}")
+                result = await run_ws_level(target, clients, args.ws_rounds, payload, args.ws_hold)
+                finish(profile)
+                report["websocket"].append(result)
+                print(f"  {result['connected']}/{clients} connected "
+                      f"({result['registered_connections']} registered), fan-out p50 {result['fanout_p50_ms']:.1f} ms, "
+                      f"lost {result['lost_messages']}")
+                if args.ws_hold > 0:
+                    print(f"  hold: {result['hold_messages']}/{result['hold_expected_messages']} messages, "
+                          f"lag p99 {result['hold_lag_p99_ms']:.1f} ms, loop stall max {result['loop_stall_max_ms']:.1f} ms")
+    finally:
+        target.stop()
+
+    with open(os.path.join(args.output, "report.json"), "w") as fh:
+        json.dump(report, fh, indent=2)
+    write_markdown(report, os.path.join(args.output, "report.md"))
+    print(f"Report written to {os.path.join(args.output, 'report.md')}")
+    return report
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load-test the Liquidity Command API against stubbed data.")
+    parser.add_argument("--mode", choices=["inprocess", "localhost"], default="inprocess",
+                        help="drive the ASGI app directly, or through uvicorn on 127.0.0.1")
+    parser.add_argument("--endpoints", type=lambda v: [p for p in v.split(",") if p],
+                        default=["/api/historical-data", "/api/liquidity-data"])
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 10, 50, 200],
+                        help="comma-separated number of concurrent pollers per level")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--ws-clients", type=_int_list, default=[10, 100, 500],
+                        help="comma-separated websocket client counts (empty to skip)")
+    parser.add_argument("--ws-rounds", type=int, default=3, help="broadcasts timed per websocket level")
+    parser.add_argument("--ws-hold", type=float, default=35.0,
+                        help="seconds to keep each level connected through the handlers' 30s broadcasts (0 to skip)")
+    parser.add_argument("--fetch-delay", type=float, default=0.0,
+                        help="seconds each stubbed FRED/Yahoo fetch blocks for")
+    parser.add_argument("--no-cache", action="store_true", help="disable series and response caches")
+    parser.add_argument("--no-gzip", action="store_true", help="request identity encoding instead of gzip")
+    parser.add_argument("--no-profile", action="store_true", help="skip stack sampling")
+    parser.add_argument("--profile-interval", type=float, default=0.005, help="stack sampling interval in seconds")
+    parser.add_argument("--cold-start", type=lambda v: [m for m in v.split(",") if m], default=[],
+                        help="comma-separated STARTUP_MODE values to time a fresh API process in")
+    parser.add_argument("--cold-start-timeout", type=float, default=120.0,
+                        help="seconds to wait for each cold start to become fresh")
+    parser.add_argument("--port", type=int, default=8765, help="port for --mode localhost (cold starts use port + 1)")
+    parser.add_argument("--output", default="loadtest-results", help="directory for report and profiles")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
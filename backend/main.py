@@ -1,8 +1,11 @@
+import time
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 import uvicorn
 import asyncio
 from datetime import datetime
@@ -13,14 +16,22 @@ from dotenv import load_dotenv
 
 from services.liquidity_service import LiquidityService
 from services.websocket_manager import WebSocketManager
+from services.startup_metrics import StartupMetrics, FirstResponseMiddleware
 from models.liquidity_models import LiquidityData, SignalStatus, MetricData
 
+startup_metrics = StartupMetrics(_import_started)
+
 # Load environment variables
 try:
     load_dotenv()
 except:
     pass  # Continue without .env file
 
+# "eager" blocks startup on the pre-warm; "fast" serves the persisted snapshot
+# immediately and pre-warms in the background.
+STARTUP_MODE = os.getenv("STARTUP_MODE", "eager").lower()
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "data/liquidity_snapshot.json")
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Liquidity Command API",
@@ -40,24 +51,58 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(FirstResponseMiddleware, metrics=startup_metrics)
+
 # Initialize services
 liquidity_service = LiquidityService()
 websocket_manager = WebSocketManager()
+startup_metrics.mark_imported()
 
 @app.get("/")
 async def root():
     return {"message": "Liquidity Command API", "version": "2.1.7", "status": "operational"}
 
+def _format_uptime(seconds: float) -> str:
+    hours, remainder = divmod(int(seconds), 3600)
+    minutes, secs = divmod(remainder, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
 @app.get("/api/health")
 async def health_check():
+    snapshot_saved_at = liquidity_service.snapshot_saved_at
     return {
         "status": "healthy",
+        "live": True,
+        "ready": liquidity_service.ready,
+        "fresh": liquidity_service.fresh,
+        "liquidity_fresh": liquidity_service.liquidity_fresh,
+        "history_fresh": liquidity_service.history_fresh,
+        "serving_snapshot": liquidity_service.serving_snapshot,
+        "snapshot_saved_at": snapshot_saved_at.isoformat() if snapshot_saved_at else None,
+        "startup_mode": STARTUP_MODE,
+        "startup": {**startup_metrics.to_dict(), "prewarm_seconds": liquidity_service.prewarm_seconds},
         "timestamp": datetime.now().isoformat(),
-        "uptime": "72:14:33",
+        "uptime": _format_uptime(startup_metrics.elapsed()),
         "data_points": 1247,
         "signals": 3
     }
 
+@app.get("/api/health/live")
+async def liveness_check():
+    """Liveness probe: the process is up and the event loop is responsive"""
+    return {"status": "alive"}
+
+@app.get("/api/health/ready")
+async def readiness_check():
+    """Readiness probe: data can be served, from a snapshot or freshly computed"""
+    if not liquidity_service.ready:
+        return JSONResponse(status_code=503, content={"status": "warming", "fresh": False})
+    return {
+        "status": "ready",
+        "fresh": liquidity_service.fresh,
+        "serving_snapshot": liquidity_service.serving_snapshot,
+    }
+
 @app.get("/api/liquidity-data", response_model=LiquidityData)
 async def get_liquidity_data():
     """Get current liquidity data and signals"""
@@ -116,13 +161,32 @@ async def websocket_endpoint(websocket: WebSocket):
 @app.on_event("startup")
 async def startup_event():
     """Start background tasks on startup"""
-    # Pre-warm cache to reduce first-hit latency
-    try:
-        await liquidity_service.get_liquidity_data()
-        await liquidity_service.get_historical_data(365)
-    except Exception as e:
-        print(f"Pre-warm error: {e}")
+    if STARTUP_MODE == "fast":
+        if SNAPSHOT_PATH and liquidity_service.load_snapshot(SNAPSHOT_PATH):
+            print(f"Serving snapshot from {liquidity_service.snapshot_saved_at} while pre-warming")
+        asyncio.create_task(background_prewarm())
+    else:
+        # Pre-warm cache to reduce first-hit latency
+        try:
+            await liquidity_service.prewarm(SNAPSHOT_PATH)
+        except Exception as e:
+            # Keep retrying in the background so the process can still become fresh
+            print(f"Pre-warm error, retrying in 60s: {e}")
+            asyncio.create_task(background_prewarm(delay=60))
     asyncio.create_task(periodic_update())
+    startup_metrics.mark_started()
+
+async def background_prewarm(delay: float = 0):
+    """Pre-warm without blocking startup, retrying until it succeeds"""
+    await asyncio.sleep(delay)
+    while True:
+        try:
+            await liquidity_service.prewarm(SNAPSHOT_PATH)
+            print(f"Pre-warm finished in {liquidity_service.prewarm_seconds:.1f}s")
+            return
+        except Exception as e:
+            print(f"Pre-warm error, retrying in 60s: {e}")
+            await asyncio.sleep(60)
 
 async def periodic_update():
     """Periodic update task"""
@@ -132,6 +196,8 @@ async def periodic_update():
             await asyncio.sleep(300)
             data = await liquidity_service.get_liquidity_data()
             await websocket_manager.broadcast(data.dict())
+            if SNAPSHOT_PATH and liquidity_service.fresh:
+                await asyncio.to_thread(liquidity_service.save_snapshot, SNAPSHOT_PATH)
         except Exception as e:
             print(f"Error in periodic update: {e}")
 
@@ -0,0 +1,28 @@
+import importlib
+import time
+from typing import Any, Dict, Sequence
+
+# module name -> seconds spent importing it on first use, excluding any
+# `requires` modules (those are loaded and timed separately beforehand)
+import_timings: Dict[str, float] = {}
+
+
+class LazyModule:
+    """Stand-in for a heavy module that is only imported on first attribute access."""
+
+    def __init__(self, name: str, requires: Sequence["LazyModule"] = ()):
+        self._name = name
+        self._requires = tuple(requires)
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            for dependency in self._requires:
+                dependency._load()
+            started = time.perf_counter()
+            self._module = importlib.import_module(self._name)
+            import_timings[self._name] = time.perf_counter() - started
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
@@ -1,18 +1,26 @@
-import pandas as pd
-import numpy as np
+from __future__ import annotations
+
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import asyncio
-from fredapi import Fred
+import json
 import os
+import time
 import warnings
 warnings.filterwarnings("ignore")
-import yfinance as yf
 
 from models.liquidity_models import (
     LiquidityData, SignalStatus, MetricData, SignalType, 
     HistoricalDataPoint, SystemStatus, ChartData, DashboardData
 )
+from services.lazy_imports import LazyModule
+
+# pandas, fredapi and yfinance take seconds to import; defer them to first use
+# so the API can start serving (e.g. from a snapshot) before they are loaded.
+pd = LazyModule("pandas")
+# Both import pandas themselves; load it first so each module's import time is its own.
+fredapi = LazyModule("fredapi", requires=[pd])
+yf = LazyModule("yfinance", requires=[pd])
 
 class LiquidityService:
     def __init__(self):
@@ -23,12 +31,104 @@ class LiquidityService:
                 "FRED_API_KEY not found. Create a .env file with FRED_API_KEY=your_key"
             )
         
-        self.fred = Fred(api_key=self.fred_api_key)
+        self._fred = None
         self._cache: Dict[str, Any] = {}
         self._cache_timeout = 3600  # 1 hour
         # Lightweight response cache for expensive endpoints
         self._response_cache: Dict[str, Any] = {}
         self._response_cache_timeout = 900  # 15 minutes
+        # Last known good responses loaded from disk, served until pre-warm completes
+        self._snapshot: Dict[str, Any] = {}
+        self.snapshot_saved_at: Optional[datetime] = None
+        self._latest_liquidity: Optional[LiquidityData] = None
+        # Set once current data / the 365-day history have been computed since startup,
+        # tracked separately so a failing history pull doesn't hold back current data
+        self.liquidity_fresh = False
+        self.history_fresh = False
+        self.prewarm_seconds: Optional[float] = None
+        # Serializes cold computations so requests don't race the pre-warm for the same pulls
+        self._warm_lock = asyncio.Lock()
+
+    @property
+    def fred(self):
+        if self._fred is None:
+            self._fred = fredapi.Fred(api_key=self.fred_api_key)
+        return self._fred
+
+    @property
+    def fresh(self) -> bool:
+        return self.liquidity_fresh and self.history_fresh
+
+    @property
+    def ready(self) -> bool:
+        """Current data can be served, computed or from the snapshot."""
+        return self.liquidity_fresh or bool(self._snapshot)
+
+    @property
+    def serving_snapshot(self) -> bool:
+        return not self.fresh and bool(self._snapshot)
+
+    async def prewarm(self, snapshot_path: Optional[str] = None):
+        """Compute current and 365-day data off the event loop, then mark the service fresh.
+
+        Parts that already succeeded are skipped, so a retry only redoes what failed.
+        """
+        async with self._warm_lock:
+            started = time.perf_counter()
+            if not self.liquidity_fresh:
+                await asyncio.to_thread(self._compute_liquidity_data)
+                self.liquidity_fresh = True
+            if not self.history_fresh:
+                await asyncio.to_thread(self._compute_historical_data, 365)
+                self.history_fresh = True
+            self.prewarm_seconds = time.perf_counter() - started
+        if snapshot_path:
+            # A read-only volume must not make callers treat the pre-warm as failed
+            try:
+                await asyncio.to_thread(self.save_snapshot, snapshot_path)
+            except Exception as e:
+                print(f"Error saving snapshot to {snapshot_path}: {e}")
+
+    def save_snapshot(self, path: str):
+        """Persist the latest liquidity data and cached historical responses as JSON."""
+        if self._latest_liquidity is None:
+            return
+        snapshot = {
+            "saved_at": datetime.now(),
+            "liquidity": self._latest_liquidity.dict(),
+            "historical": {
+                key.split(":", 1)[1]: [point.dict() for point in cached[1]]
+                for key, cached in list(self._response_cache.items())
+                if key.startswith("historical:")
+            },
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(snapshot, fh, default=str)
+        os.replace(tmp_path, path)
+
+    def load_snapshot(self, path: str) -> bool:
+        """Load a snapshot written by save_snapshot. Returns False if none is usable."""
+        try:
+            with open(path) as fh:
+                raw = json.load(fh)
+            self._snapshot = {
+                "liquidity": LiquidityData(**raw["liquidity"]),
+                "historical": {
+                    int(days): [HistoricalDataPoint(**point) for point in points]
+                    for days, points in raw.get("historical", {}).items()
+                },
+            }
+            self.snapshot_saved_at = datetime.fromisoformat(raw["saved_at"])
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"Ignoring unreadable snapshot {path}: {e}")
+            return False
 
     def _get_series(self, series_id: str) -> pd.Series:
         """Fetch a FRED series with simple in-memory caching and error handling."""
@@ -47,6 +147,10 @@ class LiquidityService:
         except Exception as exc:
             raise Exception(f"Failed to fetch FRED series '{series_id}': {exc}")
 
+    def _download_close(self, ticker: str, start: str, end: str) -> pd.DataFrame:
+        """Download daily closes for a market ticker as a single 'Close' column frame."""
+        return yf.download(ticker, start=start, end=end, progress=False)[['Close']]
+
     def _calculate_monthly_yoy(self, monthly_series: pd.Series) -> float:
         """Calculate YoY using native monthly frequency (last vs 12 months ago)."""
         if monthly_series.empty:
@@ -78,6 +182,17 @@ class LiquidityService:
 
     async def get_liquidity_data(self) -> LiquidityData:
         """Get current liquidity data and calculate signals"""
+        if self.liquidity_fresh:
+            return self._compute_liquidity_data()
+        if self._snapshot:
+            return self._snapshot["liquidity"]
+        # Cold: wait for any in-flight pre-warm and keep the pull off the event loop
+        async with self._warm_lock:
+            data = await asyncio.to_thread(self._compute_liquidity_data)
+            self.liquidity_fresh = True
+            return data
+
+    def _compute_liquidity_data(self) -> LiquidityData:
         try:
             # Fetch data from FRED
             fed_data = self._get_series('WALCL')              # Fed balance sheet (weekly)
@@ -101,7 +216,7 @@ class LiquidityService:
             # Create signal status
             signal_status = self._create_signal_status(signal)
 
-            return LiquidityData(
+            data = LiquidityData(
                 timestamp=datetime.now(),
                 fed_yoy=fed_yoy,
                 m2_yoy=m2_yoy,
@@ -110,6 +225,8 @@ class LiquidityService:
                 signal=signal,
                 signal_status=signal_status
             )
+            self._latest_liquidity = data
+            return data
         except Exception as e:
             raise Exception(f"Error fetching liquidity data: {str(e)}")
 
@@ -232,6 +349,15 @@ class LiquidityService:
         ]
 
     async def get_historical_data(self, days: int = 365) -> List[HistoricalDataPoint]:
+        """Get historical liquidity data, from the snapshot while it is being served."""
+        if self.history_fresh:
+            return self._compute_historical_data(days)
+        if days in self._snapshot.get("historical", {}):
+            return self._snapshot["historical"][days]
+        async with self._warm_lock:
+            return await asyncio.to_thread(self._compute_historical_data, days)
+
+    def _compute_historical_data(self, days: int = 365) -> List[HistoricalDataPoint]:
         """Get historical liquidity data from FRED and compute metrics.
         - Limited to actual FRED dates
         - Simplified to avoid complex processing that might cause errors
@@ -280,8 +406,8 @@ class LiquidityService:
             try:
                 dl_start = (start_date - pd.Timedelta(days=10)).strftime('%Y-%m-%d')
                 dl_end = (end_date + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
-                btc_df = yf.download('BTC-USD', start=dl_start, end=dl_end, progress=False)[['Close']].rename(columns={'Close':'btc'})
-                spx_df = yf.download('^GSPC', start=dl_start, end=dl_end, progress=False)[['Close']].rename(columns={'Close':'spx'})
+                btc_df = self._download_close('BTC-USD', dl_start, dl_end).rename(columns={'Close':'btc'})
+                spx_df = self._download_close('^GSPC', dl_start, dl_end).rename(columns={'Close':'spx'})
                 market = btc_df.join(spx_df, how='outer').sort_index()
                 market.index = pd.to_datetime(market.index)
                 market = market.ffill().dropna()
@@ -0,0 +1,57 @@
+import time
+from typing import Any, Dict, Optional
+
+from services.lazy_imports import import_timings
+
+
+class StartupMetrics:
+    """Cold-start timeline, in seconds since the API module began importing."""
+
+    def __init__(self, started: float):
+        self.started = started
+        self.import_seconds: Optional[float] = None
+        self.startup_seconds: Optional[float] = None
+        self.first_response_seconds: Optional[float] = None
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def mark_imported(self):
+        self.import_seconds = self.elapsed()
+        print(f"API imports finished in {self.import_seconds:.3f}s")
+
+    def mark_started(self):
+        self.startup_seconds = self.elapsed()
+        print(f"API ready to serve {self.startup_seconds:.3f}s after import began")
+
+    def mark_first_response(self):
+        self.first_response_seconds = self.elapsed()
+        print(f"First response sent {self.first_response_seconds:.3f}s after import began")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "import_seconds": self.import_seconds,
+            "startup_seconds": self.startup_seconds,
+            "time_to_first_response_seconds": self.first_response_seconds,
+            "lazy_import_seconds": dict(import_timings),
+        }
+
+
+class FirstResponseMiddleware:
+    """ASGI middleware that records when the first HTTP response starts."""
+
+    def __init__(self, app, metrics: StartupMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.metrics.first_response_seconds is not None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and self.metrics.first_response_seconds is None:
+                self.metrics.mark_first_response()
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)